@@ -1,9 +1,13 @@
-from typing import TypedDict, List
-from langchain_core.messages import BaseMessage, HumanMessage
+from typing import TypedDict, List, Dict, Any, Optional, Protocol
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langchain_core.runnables import Runnable
 from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 import os
+import re
+import threading
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -12,11 +16,25 @@ load_dotenv()
 # Securely load your GROQ API key
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
+# Matches public Credly badge URLs and captures the badge UUID
+CREDLY_BADGE_URL_RE = re.compile(
+    r"https?://(?:www\.)?credly\.com/badges/"
+    r"([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})",
+    re.IGNORECASE,
+)
+
+# Upper bound on concurrent provider lookups for a single message
+MAX_BADGE_LOOKUP_WORKERS = 8
+
+# Maximum number of resolved badges kept in the cache (least recently used are evicted)
+BADGE_CACHE_SIZE = 1024
+
 class AgentState(TypedDict):
     """
     Defines the state passed between nodes in the agent graph.
     """
     messages: List[BaseMessage]
+    badge_results: Dict[str, Optional[Dict[str, Any]]]
 
 # Initialize the LLM with the Groq API key and model name
 llm = ChatGroq(
@@ -24,24 +42,208 @@ llm = ChatGroq(
     model="llama-3.3-70b-versatile"
 )
 
+
+# ==================== BADGE DATA PROVIDERS ====================
+
+class BadgeDataProvider(Protocol):
+    """
+    Resolves a Credly badge UUID to its credit point details.
+    Returns None when the badge is unknown to the provider.
+    """
+    def fetch_badge(self, badge_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+# Local stand-in for the Credly API (in production, swap in an API-backed provider)
+LOCAL_BADGE_FIXTURES = {
+    "e192db17-f8c5-46aa-8f99-8a565223f1d6": {
+        "name": "AWS Certified Cloud Practitioner",
+        "issuer": "Amazon Web Services Training and Certification",
+        "credit_points": 10,
+        "skills": ["AWS Cloud", "Cloud Computing", "Security", "Pricing"],
+    },
+}
+
+class LocalFixtureBadgeProvider:
+    """
+    Serves badge details from an in-memory fixture dictionary.
+    """
+    def __init__(self, fixtures: Optional[Dict[str, Dict[str, Any]]] = None):
+        fixtures = LOCAL_BADGE_FIXTURES if fixtures is None else fixtures
+        self.fixtures = {badge_id.lower(): data for badge_id, data in fixtures.items()}
+
+    def fetch_badge(self, badge_id: str) -> Optional[Dict[str, Any]]:
+        return self.fixtures.get(badge_id)
+
+badge_provider: BadgeDataProvider = LocalFixtureBadgeProvider()
+
+# Credit point results keyed by badge UUID; only successful lookups are cached,
+# so unknown or temporarily unavailable badges are retried on the next message
+badge_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+badge_cache_lock = threading.Lock()
+
+# Shared worker pool for concurrent provider lookups, reused across messages
+badge_lookup_executor = ThreadPoolExecutor(max_workers=MAX_BADGE_LOOKUP_WORKERS)
+
+def set_badge_provider(provider: BadgeDataProvider) -> None:
+    """
+    Replaces the active badge data provider and clears cached results.
+    """
+    global badge_provider
+    badge_provider = provider
+    with badge_cache_lock:
+        badge_cache.clear()
+
+def extract_badge_ids(text: str) -> List[str]:
+    """
+    Returns the unique badge UUIDs in the text, lowercased, in order of appearance.
+    """
+    return list(dict.fromkeys(match.lower() for match in CREDLY_BADGE_URL_RE.findall(text)))
+
+def fetch_badge_safely(badge_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetches a badge from the provider, treating any provider error as unresolved.
+    """
+    try:
+        return badge_provider.fetch_badge(badge_id)
+    except Exception as e:
+        print(f"⚠️ Badge lookup failed for {badge_id}: {e}")
+        return None
+
+def get_cached_badge(badge_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns a cached badge and marks it as recently used, or None on a miss.
+    """
+    with badge_cache_lock:
+        data = badge_cache.get(badge_id)
+        if data is not None:
+            badge_cache.move_to_end(badge_id)
+        return data
+
+def cache_badge(badge_id: str, data: Dict[str, Any]) -> None:
+    """
+    Stores a resolved badge, evicting the least recently used entry when full.
+    """
+    with badge_cache_lock:
+        badge_cache[badge_id] = data
+        badge_cache.move_to_end(badge_id)
+        while len(badge_cache) > BADGE_CACHE_SIZE:
+            badge_cache.popitem(last=False)
+
+def resolve_badges(badge_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Resolves badge UUIDs through the cache, fetching misses from the provider concurrently.
+    Badges the provider does not know, or fails to return, resolve to None.
+    """
+    results: Dict[str, Optional[Dict[str, Any]]] = {}
+    missing = []
+    for badge_id in badge_ids:
+        data = get_cached_badge(badge_id)
+        if data is None:
+            missing.append(badge_id)
+        else:
+            results[badge_id] = data
+
+    if len(missing) == 1:
+        fetched = [fetch_badge_safely(missing[0])]
+    elif missing:
+        fetched = list(badge_lookup_executor.map(fetch_badge_safely, missing))
+    else:
+        fetched = []
+
+    for badge_id, data in zip(missing, fetched):
+        results[badge_id] = data
+        if data is not None:
+            cache_badge(badge_id, data)
+    return {badge_id: results[badge_id] for badge_id in badge_ids}
+
+def format_badge_summary(badge_id: str, data: Dict[str, Any]) -> str:
+    """
+    Formats a resolved badge as a short credit point summary.
+    """
+    return (
+        f"{data['name']} (issued by {data['issuer']})\n"
+        f"  Badge ID: {badge_id}\n"
+        f"  Credit points: {data['credit_points']}\n"
+        f"  Skills: {', '.join(data['skills'])}"
+    )
+
+
+# ==================== GRAPH NODES ====================
+
+def lookup_badges(state: AgentState) -> AgentState:
+    """
+    Extracts Credly badge URLs from the latest message and resolves their credit points.
+    """
+    badge_ids = extract_badge_ids(state["messages"][-1].content)
+    state["badge_results"] = resolve_badges(badge_ids)
+    return state
+
+def respond_from_badges(state: AgentState) -> AgentState:
+    """
+    Answers directly from resolved badge data without calling the language model.
+    """
+    summaries = [format_badge_summary(badge_id, data) for badge_id, data in state["badge_results"].items()]
+    state["messages"].append(AIMessage(content="\n\n".join(summaries)))
+    return state
+
+def route_after_lookup(state: AgentState) -> str:
+    """
+    Uses the fast path only when every badge in the message was resolved.
+    """
+    results = state["badge_results"]
+    if results and all(data is not None for data in results.values()):
+        return "badges"
+    return "respond"
+
+def badge_context_message(badge_results: Dict[str, Optional[Dict[str, Any]]]) -> Optional[SystemMessage]:
+    """
+    Builds a system message with the badges that were resolved, so the model
+    only has to reason about the ones it could not be given data for.
+    """
+    known = [format_badge_summary(badge_id, data) for badge_id, data in badge_results.items() if data is not None]
+    if not known:
+        return None
+    unknown = [badge_id for badge_id, data in badge_results.items() if data is None]
+    content = "Verified Credly badge data (use these values as-is):\n\n" + "\n\n".join(known)
+    if unknown:
+        content += "\n\nNo data is available for these badges: " + ", ".join(unknown)
+    return SystemMessage(content=content)
+
 def call_model(state: AgentState) -> AgentState:
     """
     Calls the language model with the current messages and appends the response.
+    Resolved badge data is supplied as context without being added to the history.
     """
-    response = llm.invoke(state["messages"])
+    context = badge_context_message(state.get("badge_results", {}))
+    messages = [context] + state["messages"] if context else state["messages"]
+    response = llm.invoke(messages)
     state["messages"].append(response)
     return state
 
 # Build the agent graph
 builder = StateGraph(AgentState)
+builder.add_node("lookup", lookup_badges)
+builder.add_node("badges", respond_from_badges)
 builder.add_node("respond", call_model)
-builder.set_entry_point("respond")
+builder.set_entry_point("lookup")
+builder.add_conditional_edges(
+    "lookup",
+    route_after_lookup,
+    {
+        "badges": "badges",
+        "respond": "respond"
+    }
+)
+builder.add_edge("badges", END)
 builder.add_edge("respond", END)
 graph = builder.compile()
 
 if __name__ == "__main__":
     # Example input message (you can change the content as needed)
-    inputs = {"messages": [HumanMessage(content="Check Credly credit point details from https://www.credly.com/badges/e192db17-f8c5-46aa-8f99-8a565223f1d6?")]}
+    inputs = {
+        "messages": [HumanMessage(content="Check Credly credit point details from https://www.credly.com/badges/e192db17-f8c5-46aa-8f99-8a565223f1d6?")],
+        "badge_results": {}
+    }
     print("Response:")
     response = graph.invoke(inputs)
     print(response["messages"][-1].content)
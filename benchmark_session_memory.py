@@ -0,0 +1,88 @@
+"""
+Credly AI Assistant - Session Memory Benchmark
+Measures bytes per live session with tracemalloc, comparing the previous
+representation (the last 6 BaseMessage objects in a list) against the compact
+SessionState.
+
+Usage:
+    python benchmark_session_memory.py
+    python benchmark_session_memory.py --sessions 1000 10000
+"""
+
+from typing import List, Callable, Any
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from dotenv import load_dotenv
+import argparse
+import gc
+import os
+import tracemalloc
+
+load_dotenv()
+
+# The benchmark never calls the Groq API, so a placeholder key is enough to import the graph
+os.environ.setdefault("GROQ_API_KEY", "benchmark-offline")
+
+from complete_agent_code import SessionState, HISTORY_LIMIT
+
+SESSION_COUNTS = (10_000, 100_000)
+
+# Realistic message sizes: short user questions, multi-paragraph assistant answers
+USER_TEXT = "What badges should I get to learn cloud computing? (session {})"
+ASSISTANT_TEXT = "☁️ Great choice! Here are my top recommendations for session {}. " + "Details. " * 60
+
+
+def build_legacy_session(index: int) -> List[BaseMessage]:
+    """
+    Previous representation: the last 6 full messages (agent outputs were discarded per turn).
+    """
+    messages = []
+    for turn in range(HISTORY_LIMIT // 2):
+        messages.append(HumanMessage(content=USER_TEXT.format(f"{index}.{turn}")))
+        messages.append(AIMessage(content=ASSISTANT_TEXT.format(f"{index}.{turn}")))
+    return messages
+
+
+def build_compact_session(index: int) -> SessionState:
+    """
+    Compact representation: slotted session with a ring buffer of compact messages.
+    """
+    session = SessionState()
+    for turn in range(HISTORY_LIMIT // 2):
+        session.history.append(HumanMessage(content=USER_TEXT.format(f"{index}.{turn}")))
+        session.history.append(AIMessage(content=ASSISTANT_TEXT.format(f"{index}.{turn}")))
+    return session
+
+
+def measure(build: Callable[[int], Any], count: int) -> float:
+    """
+    Returns the traced bytes retained per session after building `count` sessions.
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    sessions: List[Any] = [build(index) for index in range(count)]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return (current - baseline) / count
+
+
+def main():
+    """
+    Runs the benchmark for each session count and prints a comparison table.
+    """
+    parser = argparse.ArgumentParser(description="Measure per-session memory of the Credly assistant.")
+    parser.add_argument("--sessions", nargs="+", type=int, default=list(SESSION_COUNTS))
+    args = parser.parse_args()
+
+    print(f"{'Sessions':>10} | {'Legacy B/session':>17} | {'Compact B/session':>18} | {'Saved':>6}")
+    print("-" * 62)
+    for count in args.sessions:
+        legacy = measure(build_legacy_session, count)
+        compact = measure(build_compact_session, count)
+        print(f"{count:>10,} | {legacy:>17,.0f} | {compact:>18,.0f} | {1 - compact / legacy:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
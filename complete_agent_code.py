@@ -3,14 +3,15 @@ Credly AI Assistant - Multi-Agent System with LangGraph
 Implements intelligent badge discovery, verification, and career planning.
 """
 
-from typing import TypedDict, List, Dict, Any, Literal
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+from typing import TypedDict, List, Dict, Any, Literal, Iterator, Tuple
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, messages_from_dict
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 import os
 from dotenv import load_dotenv
 import json
+import sys
 
 load_dotenv()
 
@@ -26,11 +27,102 @@ llm = ChatGroq(
     temperature=0.7
 )
 
+# Number of messages kept per session (user and assistant turns combined)
+HISTORY_LIMIT = 6
+
+
+# ==================== SESSION STATE ====================
+
+class CompactMessage:
+    """Lightweight message holding only the role and text of a BaseMessage."""
+    __slots__ = ("type", "content")
+    
+    def __init__(self, type: str, content: str):
+        self.type = sys.intern(type)
+        self.content = content
+    
+    @classmethod
+    def from_message(cls, message: BaseMessage) -> "CompactMessage":
+        return cls(message.type, message.content)
+    
+    def to_message(self) -> BaseMessage:
+        return messages_from_dict([{"type": self.type, "data": {"content": self.content}}])[0]
+
+
+class MessageRingBuffer:
+    """
+    Fixed-capacity message history that overwrites the oldest entry in place.
+    Supports the list operations agents use (indexing, append, len, iteration).
+    """
+    __slots__ = ("_items", "_start", "_size")
+    
+    def __init__(self, capacity: int = HISTORY_LIMIT):
+        self._items = [None] * capacity
+        self._start = 0
+        self._size = 0
+    
+    def append(self, message) -> None:
+        """Store a message, evicting the oldest one when full."""
+        if not isinstance(message, CompactMessage):
+            message = CompactMessage.from_message(message)
+        capacity = len(self._items)
+        if self._size < capacity:
+            self._items[(self._start + self._size) % capacity] = message
+            self._size += 1
+        else:
+            self._items[self._start] = message
+            self._start = (self._start + 1) % capacity
+    
+    def __getitem__(self, index: int) -> CompactMessage:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("message index out of range")
+        return self._items[(self._start + index) % len(self._items)]
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self) -> Iterator[CompactMessage]:
+        for index in range(self._size):
+            yield self[index]
+    
+    def snapshot(self) -> Tuple[int, int, Any]:
+        """
+        Capture the position and the slot the next append will overwrite,
+        so that single append can be undone without copying the buffer.
+        """
+        return self._start, self._size, self._items[(self._start + self._size) % len(self._items)]
+    
+    def restore(self, snapshot: Tuple[int, int, Any]) -> None:
+        """Undo the append made after `snapshot` was taken."""
+        start, size, overwritten = snapshot
+        self._items[(start + size) % len(self._items)] = overwritten
+        self._start, self._size = start, size
+    
+    def clear(self) -> None:
+        self._items = [None] * len(self._items)
+        self._start = 0
+        self._size = 0
+    
+    def to_messages(self) -> List[BaseMessage]:
+        """Rebuild full LangChain messages, oldest first."""
+        return [message.to_message() for message in self]
+
+
+class SessionState:
+    """Per-session data kept between turns."""
+    __slots__ = ("history",)
+    
+    def __init__(self, capacity: int = HISTORY_LIMIT):
+        self.history = MessageRingBuffer(capacity)
+
+
 # ==================== STATE DEFINITIONS ====================
 
 class AgentState(TypedDict):
     """Global state passed between all agents."""
-    messages: List[BaseMessage]
+    messages: MessageRingBuffer
     current_agent: str
     user_intent: str
     agent_outputs: Dict[str, Any]
@@ -451,6 +543,8 @@ def response_synthesizer(state: AgentState) -> AgentState:
 
 # ==================== ROUTING LOGIC ====================
 
+INTENT_CATEGORIES = ("discovery", "verification", "planning", "management", "skills", "general")
+
 def route_to_agent(state: AgentState) -> str:
     """
     Determines which specialized agent to route to.
@@ -531,39 +625,52 @@ class CredlyAssistant:
     
     def __init__(self):
         self.graph = create_credly_assistant()
-        self.conversation_history = []
+        self.session = SessionState()
         print("✅ Credly AI Assistant initialized!\n")
     
     def chat(self, user_message: str) -> str:
         """
         Process a user message and return the assistant's response.
         """
+        result = self.run_turn(user_message)
+        return result["messages"][-1].content
+    
+    def run_turn(self, user_message: str) -> AgentState:
+        """
+        Process a user message and return the full final graph state.
+        """
+        # Append to the session's ring buffer in place (oldest messages drop off),
+        # remembering the overwritten slot so a failed turn leaves the history untouched
+        history = self.session.history
+        snapshot = history.snapshot()
+        history.append(HumanMessage(content=user_message))
+        
         # Create initial state
         state = {
-            "messages": [HumanMessage(content=user_message)],
+            "messages": history,
             "current_agent": "",
             "user_intent": "",
             "agent_outputs": {},
             "conversation_context": {}
         }
         
-        # Add conversation history
-        state["messages"] = self.conversation_history + state["messages"]
-        
         # Run the graph
-        result = self.graph.invoke(state)
-        
-        # Extract response
-        response = result["messages"][-1].content
-        
-        # Update conversation history (keep last 6 messages)
-        self.conversation_history = result["messages"][-6:]
+        try:
+            result = self.graph.invoke(state)
+        except Exception:
+            history.restore(snapshot)
+            raise
         
-        return response
+        return result
+    
+    @property
+    def conversation_history(self) -> List[BaseMessage]:
+        """Conversation history as full LangChain messages, oldest first."""
+        return self.session.history.to_messages()
     
     def reset(self):
         """Reset conversation history."""
-        self.conversation_history = []
+        self.session = SessionState()
         print("🔄 Conversation history cleared.\n")
 
 
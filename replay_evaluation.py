@@ -0,0 +1,415 @@
+"""
+Credly AI Assistant - Deterministic Replay & Regression Evaluation
+Re-executes the multi-agent graph against a recorded conversation corpus and
+compares intent accuracy, discovery relevance, latency and tokens per configuration.
+
+Corpus format (JSON Lines, one conversation per line):
+
+    {"id": "cloud-discovery",
+     "turns": [
+       {"user": "What badges should I get to learn cloud computing?",
+        "expected_intent": "discovery",
+        "expected_badges": ["aws-cloud-practitioner", "azure-fundamentals"],
+        "llm_calls": {
+          "llama-3.3-70b-versatile": [
+            {"content": "discovery", "latency_ms": 210, "prompt_tokens": 151, "completion_tokens": 2},
+            ...
+          ],
+          "*": [...]
+        }}
+     ]}
+
+`llm_calls` holds the ordered model responses for each configuration. The "*"
+entry is a hand-written (faked) fallback used by any configuration without its
+own recording. `expected_badges` is optional and only scored for discovery turns.
+
+Usage:
+    python replay_evaluation.py eval_corpus_sample.jsonl
+    python replay_evaluation.py eval_corpus_sample.jsonl --configs llama-3.3-70b-versatile llama-3.1-8b-instant
+    python replay_evaluation.py eval_corpus_sample.jsonl --record llama-3.1-8b-instant --output recorded.jsonl
+"""
+
+from typing import List, Dict, Any, Iterator
+from contextlib import contextmanager, redirect_stdout
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import Runnable
+from dotenv import load_dotenv
+import argparse
+import io
+import json
+import math
+import os
+import statistics
+import sys
+import time
+
+load_dotenv()
+
+# Replay never reaches the Groq API, so a placeholder key is enough to import the graph
+os.environ.setdefault("GROQ_API_KEY", "replay-offline")
+
+import complete_agent_code as assistant_module
+from complete_agent_code import CredlyAssistant, INTENT_CATEGORIES
+
+FALLBACK_CONFIG = "*"
+INTENT_ACCURACY_TARGET = 0.95
+
+
+class ReplayExhaustedError(RuntimeError):
+    """Raised when the graph makes more LLM calls than were recorded for a turn."""
+
+
+# ==================== CORPUS ====================
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    """
+    Loads a JSON Lines conversation corpus, skipping blank lines.
+    """
+    conversations = []
+    with open(path, encoding="utf-8") as corpus_file:
+        for line_number, line in enumerate(corpus_file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            conversation = json.loads(line)
+            if "id" not in conversation or not conversation.get("turns"):
+                raise ValueError(f"{path}:{line_number}: conversation needs an 'id' and at least one turn")
+            conversations.append(conversation)
+    return conversations
+
+
+def save_corpus(path: str, conversations: List[Dict[str, Any]]) -> None:
+    """
+    Writes conversations back out in the JSON Lines corpus format.
+    """
+    with open(path, "w", encoding="utf-8") as corpus_file:
+        for conversation in conversations:
+            corpus_file.write(json.dumps(conversation, ensure_ascii=False) + "\n")
+
+
+def corpus_configs(conversations: List[Dict[str, Any]]) -> List[str]:
+    """
+    Returns every configuration name with recordings, in order of first appearance.
+    """
+    names = {}
+    for conversation in conversations:
+        for turn in conversation["turns"]:
+            for name in turn.get("llm_calls", {}):
+                if name != FALLBACK_CONFIG:
+                    names[name] = None
+    return list(names) or [FALLBACK_CONFIG]
+
+
+# ==================== LLM STAND-INS ====================
+
+class ReplayChatModel(Runnable):
+    """
+    Chat model stand-in that returns recorded responses in order.
+    """
+
+    def __init__(self, calls: List[Dict[str, Any]]):
+        self.calls = list(calls)
+        self.position = 0
+
+    def invoke(self, input, config=None, **kwargs) -> AIMessage:
+        if self.position >= len(self.calls):
+            raise ReplayExhaustedError(
+                f"graph made LLM call #{self.position + 1} but only {len(self.calls)} were recorded"
+            )
+        call = self.calls[self.position]
+        self.position += 1
+        prompt_tokens = call.get("prompt_tokens", 0)
+        completion_tokens = call.get("completion_tokens", 0)
+        return AIMessage(
+            content=call["content"],
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        )
+
+    def latency_ms(self) -> float:
+        return sum(call.get("latency_ms", 0) for call in self.calls[:self.position])
+
+    def tokens(self) -> int:
+        return sum(
+            call.get("prompt_tokens", 0) + call.get("completion_tokens", 0)
+            for call in self.calls[:self.position]
+        )
+
+
+class RecordingChatModel(Runnable):
+    """
+    Wraps a live chat model and records each response with its latency and token usage.
+    """
+
+    def __init__(self, llm):
+        self.llm = llm
+        self.calls: List[Dict[str, Any]] = []
+
+    def invoke(self, input, config=None, **kwargs) -> AIMessage:
+        start = time.perf_counter()
+        response = self.llm.invoke(input, config, **kwargs)
+        latency_ms = (time.perf_counter() - start) * 1000
+        usage = getattr(response, "usage_metadata", None) or {}
+        self.calls.append({
+            "content": response.content,
+            "latency_ms": round(latency_ms, 1),
+            "prompt_tokens": usage.get("input_tokens", 0),
+            "completion_tokens": usage.get("output_tokens", 0)
+        })
+        return response
+
+
+@contextmanager
+def patched_llm(model) -> Iterator[None]:
+    """
+    Temporarily replaces the module-level LLM used by every agent node.
+    """
+    original = assistant_module.llm
+    assistant_module.llm = model
+    try:
+        yield
+    finally:
+        assistant_module.llm = original
+
+
+# ==================== REPLAY ====================
+
+def replay_conversation(conversation: Dict[str, Any], config: str) -> List[Dict[str, Any]]:
+    """
+    Replays one conversation under a configuration and returns per-turn results.
+    """
+    with redirect_stdout(io.StringIO()):
+        assistant = CredlyAssistant()
+
+    results = []
+    for turn in conversation["turns"]:
+        llm_calls = turn.get("llm_calls", {})
+        calls = llm_calls.get(config, llm_calls.get(FALLBACK_CONFIG))
+        if calls is None:
+            raise ValueError(f"{conversation['id']}: no recording for config '{config}' and no '*' fallback")
+
+        model = ReplayChatModel(calls)
+        start = time.perf_counter()
+        with patched_llm(model), redirect_stdout(io.StringIO()):
+            state = assistant.run_turn(turn["user"])
+        overhead_ms = (time.perf_counter() - start) * 1000
+
+        discovery = state["agent_outputs"].get("discovery", {})
+        results.append({
+            "conversation": conversation["id"],
+            "expected_intent": turn.get("expected_intent"),
+            "predicted_intent": state["user_intent"],
+            "expected_badges": turn.get("expected_badges"),
+            "found_badges": [badge["id"] for badge in discovery.get("badges", [])],
+            "llm_calls": model.position,
+            "recorded_calls": len(calls),
+            "latency_ms": model.latency_ms(),
+            "overhead_ms": overhead_ms,
+            "tokens": model.tokens()
+        })
+    return results
+
+
+def record_conversations(conversations: List[Dict[str, Any]], config: str, llm) -> List[Dict[str, Any]]:
+    """
+    Runs each conversation against a live model and stores the responses under `config`.
+    """
+    recorded = json.loads(json.dumps(conversations))
+    for conversation in recorded:
+        with redirect_stdout(io.StringIO()):
+            assistant = CredlyAssistant()
+        for turn in conversation["turns"]:
+            model = RecordingChatModel(llm)
+            with patched_llm(model), redirect_stdout(io.StringIO()):
+                assistant.run_turn(turn["user"])
+            turn.setdefault("llm_calls", {})[config] = model.calls
+        print(f"🎙️ Recorded '{conversation['id']}' under '{config}'")
+    return recorded
+
+
+# ==================== SCORING ====================
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def score_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregates per-turn results into intent, discovery, latency and token metrics.
+    """
+    labelled = [r for r in results if r["expected_intent"]]
+    correct = [r for r in labelled if r["predicted_intent"] == r["expected_intent"]]
+    off_label = [r for r in results if r["predicted_intent"] not in INTENT_CATEGORIES]
+
+    precisions, recalls = [], []
+    for r in results:
+        if r["expected_badges"] is None or r["expected_intent"] != "discovery":
+            continue
+        expected, found = set(r["expected_badges"]), set(r["found_badges"])
+        hits = len(expected & found)
+        precisions.append(hits / len(found) if found else float(not expected))
+        recalls.append(hits / len(expected) if expected else 1.0)
+
+    latencies = [r["latency_ms"] for r in results]
+    divergent = [r for r in results if r["llm_calls"] != r["recorded_calls"]]
+    return {
+        "turns": len(results),
+        "intent_accuracy": len(correct) / len(labelled) if labelled else 0.0,
+        "off_label_intents": len(off_label),
+        "discovery_precision": statistics.mean(precisions) if precisions else None,
+        "discovery_recall": statistics.mean(recalls) if recalls else None,
+        "latency_p50_ms": percentile(latencies, 0.50),
+        "latency_p95_ms": percentile(latencies, 0.95),
+        "overhead_per_turn_ms": statistics.mean(r["overhead_ms"] for r in results) if results else 0.0,
+        "tokens_per_turn": statistics.mean(r["tokens"] for r in results) if results else 0.0,
+        "llm_calls_per_turn": statistics.mean(r["llm_calls"] for r in results) if results else 0.0,
+        "misclassified": [
+            f"{r['conversation']}: expected '{r['expected_intent']}', got '{r['predicted_intent']}'"
+            for r in labelled if r not in correct
+        ],
+        # Turns that left recorded calls unused: the graph skipped a stage or
+        # routed differently, so their tokens and latency are not comparable
+        "divergent_turn_count": len(divergent),
+        "divergent_turns": [
+            f"{r['conversation']}: made {r['llm_calls']} of {r['recorded_calls']} recorded LLM calls"
+            for r in divergent
+        ]
+    }
+
+
+def evaluate(conversations: List[Dict[str, Any]], configs: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Replays the corpus under each configuration and returns scores keyed by configuration.
+    """
+    scores = {}
+    for config in configs:
+        results = []
+        for conversation in conversations:
+            results.extend(replay_conversation(conversation, config))
+        scores[config] = score_results(results)
+    return scores
+
+
+# ==================== REPORT ====================
+
+def format_report(scores: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Formats a side-by-side comparison, with deltas against the first configuration.
+    """
+    def fmt(value, pattern):
+        return "n/a" if value is None else pattern.format(value)
+
+    rows = [
+        ("Intent accuracy", "intent_accuracy", "{:.1%}"),
+        ("Off-label intents", "off_label_intents", "{:d}"),
+        ("Discovery precision", "discovery_precision", "{:.1%}"),
+        ("Discovery recall", "discovery_recall", "{:.1%}"),
+        ("Model latency p50 (ms)", "latency_p50_ms", "{:.0f}"),
+        ("Model latency p95 (ms)", "latency_p95_ms", "{:.0f}"),
+        ("Graph overhead / turn (ms, local)", "overhead_per_turn_ms", "{:.1f}"),
+        ("Tokens / turn", "tokens_per_turn", "{:.0f}"),
+        ("LLM calls / turn", "llm_calls_per_turn", "{:.2f}"),
+        ("Divergent turns", "divergent_turn_count", "{:d}")
+    ]
+    configs = list(scores)
+    baseline = scores[configs[0]]
+
+    lines = ["| Metric | " + " | ".join(configs) + " |", "|---" * (len(configs) + 1) + "|"]
+    for label, key, pattern in rows:
+        cells = []
+        for config in configs:
+            value = scores[config][key]
+            cell = fmt(value, pattern)
+            base = baseline[key]
+            if config != configs[0] and value is not None and base is not None and value != base:
+                cell += f" ({'+' if value > base else '-'}{fmt(abs(value - base), pattern)})"
+            cells.append(cell)
+        lines.append(f"| {label} | " + " | ".join(cells) + " |")
+
+    lines.append("")
+    for config in configs:
+        score = scores[config]
+        status = "✅" if score["intent_accuracy"] >= INTENT_ACCURACY_TARGET else "❌"
+        lines.append(f"{status} {config}: intent accuracy {score['intent_accuracy']:.1%} "
+                     f"(target {INTENT_ACCURACY_TARGET:.0%}) over {score['turns']} turns")
+        for miss in score["misclassified"]:
+            lines.append(f"    - {miss}")
+        for divergence in score["divergent_turns"]:
+            lines.append(f"    - divergent replay, {divergence}")
+    return "\n".join(lines)
+
+
+def find_failures(scores: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Lists configurations that miss the intent accuracy target, diverge from their
+    recordings, or fall below the first configuration on quality metrics.
+    """
+    configs = list(scores)
+    baseline = scores[configs[0]]
+    failures = []
+    for config in configs:
+        score = scores[config]
+        if score["intent_accuracy"] < INTENT_ACCURACY_TARGET:
+            failures.append(f"{config}: intent_accuracy {score['intent_accuracy']:.1%} "
+                            f"< target {INTENT_ACCURACY_TARGET:.0%}")
+        if score["divergent_turns"]:
+            failures.append(f"{config}: {len(score['divergent_turns'])} turn(s) diverged from the recording")
+    for config in configs[1:]:
+        for key in ("intent_accuracy", "discovery_precision", "discovery_recall"):
+            value, base = scores[config][key], baseline[key]
+            if value is not None and base is not None and value < base:
+                failures.append(f"{config}: {key} {value:.1%} < {base:.1%} ({configs[0]})")
+    return failures
+
+
+# ==================== MAIN EXECUTION ====================
+
+def main():
+    """
+    Command-line entry point for replaying, comparing and recording configurations.
+    """
+    parser = argparse.ArgumentParser(description="Replay the Credly assistant against a recorded corpus.")
+    parser.add_argument("corpus", help="JSON Lines conversation corpus")
+    parser.add_argument("--configs", nargs="+", help="configurations to compare; the first is the baseline")
+    parser.add_argument("--record", metavar="MODEL", help="record live Groq responses for MODEL instead of replaying")
+    parser.add_argument("--output", help="corpus path to write recordings to (defaults to the input corpus)")
+    args = parser.parse_args()
+
+    conversations = load_corpus(args.corpus)
+
+    if args.record:
+        if os.environ["GROQ_API_KEY"] == "replay-offline":
+            raise ValueError("GROQ_API_KEY not found in environment variables")
+        from langchain_groq import ChatGroq
+        # Match the production assistant's settings; only the model is swapped
+        live_llm = ChatGroq(
+            groq_api_key=os.environ["GROQ_API_KEY"],
+            model=args.record,
+            temperature=assistant_module.llm.temperature
+        )
+        save_corpus(args.output or args.corpus, record_conversations(conversations, args.record, live_llm))
+        return
+
+    scores = evaluate(conversations, args.configs or corpus_configs(conversations))
+    print(format_report(scores))
+
+    failures = find_failures(scores)
+    if failures:
+        print("\n⚠️ Quality gate failures:")
+        for failure in failures:
+            print(f"    - {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()